@@ -28,12 +28,26 @@ Reference:
 """
 
 import time
+# taken before the other imports, so the first script run counts them
+SCRIPT_START_SEC = time.perf_counter()
+# pylint: disable=wrong-import-position
 import datetime
 import streamlit as st
 import streamlit.components.v1 as stc
 from utils.simulator_util import simulate_bdo_succeeded_rate_v1
 from utils.simulator_util import simulate_bdo_succeeded_rate_v2
 from utils.simulator_util import simulate_bdo_failed_rate_v1
+from utils.simulator_util import warm_up_simulator
+from utils.startup_util import FIRST_PAGE_BUDGET_SEC
+from utils.startup_util import FIRST_SIMULATION_BUDGET_SEC
+from utils.startup_util import log_first_request
+from utils.chart_util import get_chart_update_sec
+from utils.chart_util import get_rate_array
+from utils.chart_util import get_rate_chart_spec
+from utils.chart_util import get_rate_chart_table
+from utils.chart_util import warm_up_chart
+
+TIME_RANGE = 600
 
 CUSTOM_TITLE = '''
 <div style="font-size:40px;font-weight:bolder;background-color:#fff;padding:10px;
@@ -58,9 +72,41 @@ border-radius:10px;border:5px solid #464e5f;text-align:center;">
 </div>
 '''
 
+def draw_rate_chart(rate_chart, time_utc_sec, rate_array, rate_name):
+    ''' Draw the per-second rate chart from now to the end of the window'''
+
+    elapsed_sec = min(
+        max(int(datetime.datetime.utcnow().timestamp()) - time_utc_sec, 0),
+        len(rate_array))
+    rate_chart.vega_lite_chart(
+        get_rate_chart_table(time_utc_sec + elapsed_sec, rate_array[elapsed_sec:]),
+        get_rate_chart_spec(rate_name))
+
+def draw_countdown(time_counter, rate_chart, time_utc_sec, best_time_utc_sec,
+                   rate_array, rate_name):
+    ''' Count down to the best time and redraw the chart to the window end'''
+
+    chart_update_sec = get_chart_update_sec(len(rate_array))
+    window_end_sec = time_utc_sec + len(rate_array)
+    window_count = window_end_sec - int(datetime.datetime.utcnow().timestamp())
+
+    for window_sec in range(window_count, 0, -1):
+        time_sec = max(best_time_utc_sec - window_end_sec + window_sec, 0)
+        time_counter.metric(
+            'Countdown', f'{time_sec // 60:02d}:{time_sec% 60:02d}')
+
+        if window_sec % chart_update_sec == 0:
+            draw_rate_chart(rate_chart, time_utc_sec, rate_array, rate_name)
+
+        time.sleep(1)
+
 def main():
     ''' Main funtion'''
 
+    # no-op after the first run, run_bdo_simulator_app.py does it at boot
+    warm_up_simulator()
+    warm_up_chart()
+
     #st.title('Black Desert Online simulator ')
     stc.html(CUSTOM_TITLE)
     menu_list = ['Black Desert Online simulator 1',
@@ -70,6 +116,11 @@ def main():
                  'About']
     choiced_simulator = st.sidebar.selectbox('Menu',menu_list)
 
+    # the page is up once the menu is drawn, simulations wait for user input
+    log_first_request('first_page_sec',
+                      time.perf_counter() - SCRIPT_START_SEC,
+                      FIRST_PAGE_BUDGET_SEC)
+
     if choiced_simulator == 'Black Desert Online simulator 1':
         st.subheader('Black Desert Online simulator succeeded rate v1')
         succeeded_rate = st.number_input(
@@ -80,31 +131,38 @@ def main():
         st.info(f'The input succeeded rate: {succeeded_rate}%', icon="ℹ️")
         st.text('The current config setting for simulator')
         st.text(' - simulated_times (total simulation run each second): 10000')
-        st.text(' - time_range (future time window in seconds): 600')
+        st.text(f' - time_range (future time window in seconds): {TIME_RANGE}')
         st.text(' - time_buffer (possible server latch in seconds): 0')
         st.text(' - time_utc_sec (current UTC time): '
                 f'{datetime.datetime.utcnow().strftime("%A, %B %d, %Y %I:%M:%S")}')
 
         if succeeded_rate:
             time_counter = st.empty()
+            simulation_start_sec = time.perf_counter()
+            rate_chart = st.empty()
+            time_utc_sec = int(datetime.datetime.utcnow().timestamp())
+            rate_array = get_rate_array(TIME_RANGE)
 
             with st.spinner('Start simulating result...'):
                 best_time_utc_sec, best_succeeded_rate = \
-                    simulate_bdo_succeeded_rate_v1(succeeded_rate)
+                    simulate_bdo_succeeded_rate_v1(
+                        succeeded_rate,
+                        time_range=TIME_RANGE,
+                        time_utc_sec=time_utc_sec,
+                        rate_array=rate_array)
 
-            best_time_count = \
-                best_time_utc_sec - int(datetime.datetime.utcnow().timestamp())
             best_time_converted = datetime.datetime.fromtimestamp(best_time_utc_sec)
             st.success(f'The simulate result show best succeeded rate: '
                        f'{best_succeeded_rate:.2f}%', icon="✅")
             st.warning(f'The simulate result show best time in: '
                        f'{best_time_converted.strftime("%A, %B %d, %Y %I:%M:%S")}',
                        icon="⚠️")
-
-            for time_sec in range(best_time_count, 0, -1):
-                time_counter.metric(
-                    'Countdown', f'{time_sec // 60:02d}:{time_sec% 60:02d}')
-                time.sleep(1)
+            draw_rate_chart(rate_chart, time_utc_sec, rate_array, 'succeeded rate')
+            log_first_request('first_simulation_sec',
+                              time.perf_counter() - simulation_start_sec,
+                              FIRST_SIMULATION_BUDGET_SEC)
+            draw_countdown(time_counter, rate_chart, time_utc_sec,
+                           best_time_utc_sec, rate_array, 'succeeded rate')
     elif choiced_simulator == 'Black Desert Online simulator 2':
         st.subheader('Black Desert Online simulator succeeded rate v2')
         succeeded_rate = st.number_input(
@@ -115,31 +173,38 @@ def main():
         st.info(f'The input succeeded rate: {succeeded_rate}%', icon="ℹ️")
         st.text('The current config setting for simulator')
         st.text(' - simulated_times (total simulation run each second): 10000')
-        st.text(' - time_range (future time window in seconds): 600')
+        st.text(f' - time_range (future time window in seconds): {TIME_RANGE}')
         st.text(' - time_buffer (possible server latch in seconds): 0')
         st.text(' - time_utc_sec (current UTC time): '
                 f'{datetime.datetime.utcnow().strftime("%A, %B %d, %Y %I:%M:%S")}')
 
         if succeeded_rate:
             time_counter = st.empty()
+            simulation_start_sec = time.perf_counter()
+            rate_chart = st.empty()
+            time_utc_sec = int(datetime.datetime.utcnow().timestamp())
+            rate_array = get_rate_array(TIME_RANGE)
 
             with st.spinner('Start simulating result...'):
                 best_time_utc_sec, best_succeeded_rate = \
-                    simulate_bdo_succeeded_rate_v2(succeeded_rate)
+                    simulate_bdo_succeeded_rate_v2(
+                        succeeded_rate,
+                        time_range=TIME_RANGE,
+                        time_utc_sec=time_utc_sec,
+                        rate_array=rate_array)
 
-            best_time_count = \
-                best_time_utc_sec - int(datetime.datetime.utcnow().timestamp())
             best_time_converted = datetime.datetime.fromtimestamp(best_time_utc_sec)
             st.success(f'The simulate result show best succeeded rate: '
                        f'{best_succeeded_rate:.2f}%', icon="✅")
             st.warning(f'The simulate result show best time in: '
                        f'{best_time_converted.strftime("%A, %B %d, %Y %I:%M:%S")}',
                        icon="⚠️")
-
-            for time_sec in range(best_time_count, 0, -1):
-                time_counter.metric(
-                    'Countdown', f'{time_sec // 60:02d}:{time_sec% 60:02d}')
-                time.sleep(1)
+            draw_rate_chart(rate_chart, time_utc_sec, rate_array, 'succeeded rate')
+            log_first_request('first_simulation_sec',
+                              time.perf_counter() - simulation_start_sec,
+                              FIRST_SIMULATION_BUDGET_SEC)
+            draw_countdown(time_counter, rate_chart, time_utc_sec,
+                           best_time_utc_sec, rate_array, 'succeeded rate')
     elif choiced_simulator == 'Black Desert Online simulator 3':
         st.subheader('Black Desert Online simulator failed rate v1')
         succeeded_rate = st.number_input(
@@ -152,31 +217,38 @@ def main():
                 icon="ℹ️")
         st.text('The current config setting for simulator')
         st.text(' - simulated_times (total simulation run each second): 10000')
-        st.text(' - time_range (future time window in seconds): 600')
+        st.text(f' - time_range (future time window in seconds): {TIME_RANGE}')
         st.text(' - time_buffer (possible server latch in seconds): 0')
         st.text(' - time_utc_sec (current UTC time): '
                 f'{datetime.datetime.utcnow().strftime("%A, %B %d, %Y %I:%M:%S")}')
 
         if succeeded_rate:
             time_counter = st.empty()
+            simulation_start_sec = time.perf_counter()
+            rate_chart = st.empty()
+            time_utc_sec = int(datetime.datetime.utcnow().timestamp())
+            rate_array = get_rate_array(TIME_RANGE)
 
             with st.spinner('Start simulating result...'):
                 best_time_utc_sec, best_failed_rate = \
-                    simulate_bdo_failed_rate_v1(succeeded_rate)
+                    simulate_bdo_failed_rate_v1(
+                        succeeded_rate,
+                        time_range=TIME_RANGE,
+                        time_utc_sec=time_utc_sec,
+                        rate_array=rate_array)
 
-            best_time_count = \
-                best_time_utc_sec - int(datetime.datetime.utcnow().timestamp())
             best_time_converted = datetime.datetime.fromtimestamp(best_time_utc_sec)
             st.error(f'The simulate result show best failed rate: '
                      f'{best_failed_rate:.2f}%', icon="🚨")
             st.warning(f'The simulate result show best time in: '
                        f'{best_time_converted.strftime("%A, %B %d, %Y %I:%M:%S")}',
                        icon="⚠️")
-
-            for time_sec in range(best_time_count, 0, -1):
-                time_counter.metric(
-                    'Countdown', f'{time_sec // 60:02d}:{time_sec% 60:02d}')
-                time.sleep(1)
+            draw_rate_chart(rate_chart, time_utc_sec, rate_array, 'failed rate')
+            log_first_request('first_simulation_sec',
+                              time.perf_counter() - simulation_start_sec,
+                              FIRST_SIMULATION_BUDGET_SEC)
+            draw_countdown(time_counter, rate_chart, time_utc_sec,
+                           best_time_utc_sec, rate_array, 'failed rate')
     elif choiced_simulator == 'Black Desert Online simulator 4':
         st.subheader('Black Desert Online simulator failed rate v2')
         st.info('This is info')
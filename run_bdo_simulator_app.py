@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2022 Weikun Han
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+""" The Black Desert Online simulator web application with warm start
+Author:
+Weikun Han <weikunhan@g.ucla.edu>
+Reference:
+"""
+
+import os
+import sys
+from utils.logger_util import initial_log
+from utils.startup_util import get_startup_report
+
+APP_PATH = os.path.join(
+    os.path.abspath(os.path.dirname(__file__)), 'bdo_simulator_app.py')
+
+def main():
+    """ Main funtion"""
+
+    initial_log()
+    get_startup_report()
+
+    # hand off to the Streamlit CLI in this process, so it reuses the warm pool
+    # and honors command line flags and STREAMLIT_* environment variables
+    from streamlit.web import cli
+    sys.argv = ['streamlit', 'run', APP_PATH] + sys.argv[1:]
+    cli.main()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2022 Weikun Han
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+""" Chart utility library Test
+Author:
+Weikun Han <weikunhan@g.ucla.edu>
+Reference:
+"""
+
+import subprocess
+import sys
+import unittest
+import numpy as np
+from utils.chart_util import get_rate_array
+from utils.chart_util import get_rate_chart_spec
+from utils.chart_util import get_rate_chart_table
+from utils.simulator_util import close_simulator_pool
+from utils.simulator_util import simulate_bdo_failed_rate_v1
+from utils.simulator_util import simulate_bdo_succeeded_rate_v1
+from utils.simulator_util import simulate_bdo_succeeded_rate_v2
+
+class TestChart(unittest.TestCase):
+    ''' Chart utility library Test'''
+
+    def setUp(self):
+        ''' Setup Test'''
+
+        self.succeeded_rate = 30.0
+        self.time_range = 60
+        self.simiulated_times = 1000
+        self.time_utc_sec = 1660000000
+
+    def tearDown(self):
+        ''' Teardown Test'''
+
+        close_simulator_pool()
+
+    def test_rate_array_same(self):
+        ''' Test simulate functions fill the same rates as the best rate'''
+
+        rate_array_v1 = get_rate_array(self.time_range)
+        rate_array_v2 = get_rate_array(self.time_range)
+        rate_array_failed = get_rate_array(self.time_range)
+        best_time_utc_sec, best_succeeded_rate = simulate_bdo_succeeded_rate_v1(
+            self.succeeded_rate,
+            simiulated_times=self.simiulated_times,
+            time_range=self.time_range,
+            time_utc_sec=self.time_utc_sec,
+            rate_array=rate_array_v1)
+        simulate_bdo_succeeded_rate_v2(
+            self.succeeded_rate,
+            simiulated_times=self.simiulated_times,
+            time_range=self.time_range,
+            time_utc_sec=self.time_utc_sec,
+            rate_array=rate_array_v2)
+        _, best_failed_rate = simulate_bdo_failed_rate_v1(
+            self.succeeded_rate,
+            simiulated_times=self.simiulated_times,
+            time_range=self.time_range,
+            time_utc_sec=self.time_utc_sec,
+            rate_array=rate_array_failed)
+
+        self.assertTrue(np.array_equal(rate_array_v1, rate_array_v2))
+        self.assertEqual(rate_array_v1.max(), best_succeeded_rate)
+        self.assertEqual(int(rate_array_v1.argmax()),
+                         best_time_utc_sec - self.time_utc_sec)
+        self.assertEqual(rate_array_failed.max(), best_failed_rate)
+
+    def test_table_zero_copy(self):
+        ''' Test chart table shares memory with the rate array'''
+
+        rate_array = get_rate_array(86400)
+        rate_table = get_rate_chart_table(self.time_utc_sec, rate_array[600:])
+        column_array = rate_table.column('rate').chunk(0).to_numpy()
+
+        self.assertEqual(rate_table.num_rows, 86400 - 600)
+        self.assertTrue(np.shares_memory(column_array, rate_array))
+        self.assertEqual(rate_table.column('time')[0].value,
+                         self.time_utc_sec)
+
+    def test_spec_top_k(self):
+        ''' Test chart spec marks the top k seconds'''
+
+        rate_chart_spec = get_rate_chart_spec('succeeded rate', top_k=3)
+
+        self.assertEqual(rate_chart_spec['layer'][1]['transform'][1]['filter'],
+                         'datum.rank <= 3')
+
+    def test_warm_up_chart(self):
+        ''' Test chart warm up loads pyarrow only when called, once'''
+
+        code = ('import sys\n'
+                'from utils.chart_util import warm_up_chart\n'
+                'print("pyarrow" in sys.modules)\n'
+                'print(warm_up_chart(), warm_up_chart(), "pyarrow" in sys.modules)')
+        output = subprocess.check_output([sys.executable, '-c', code], text=True)
+
+        self.assertEqual(output.split('\n')[:2], ['False', 'True False True'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2022 Weikun Han
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+""" Startup utility library Test
+Author:
+Weikun Han <weikunhan@g.ucla.edu>
+Reference:
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from streamlit import config
+import run_bdo_simulator_app
+from utils.simulator_util import close_simulator_pool
+from utils.simulator_util import get_simulator_pool
+from utils.simulator_util import warm_up_simulator
+from utils import startup_util
+from utils.startup_util import get_import_time
+from utils.startup_util import get_startup_report
+from utils.startup_util import log_first_request
+
+class TestStartup(unittest.TestCase):
+    ''' Startup utility library Test'''
+
+    def tearDown(self):
+        ''' Teardown Test'''
+
+        close_simulator_pool()
+
+    def test_simulator_import_lazy(self):
+        ''' Test simulator import does not load heavy modules'''
+
+        code = ('import sys\n'
+                'import utils.simulator_util\n'
+                'print("numpy" in sys.modules, "multiprocessing.pool" in sys.modules)')
+        output = subprocess.check_output([sys.executable, '-c', code], text=True)
+
+        self.assertEqual(output.strip(), 'False False')
+
+    def test_warm_up_once(self):
+        ''' Test warm up only run the first time'''
+
+        close_simulator_pool()
+
+        self.assertTrue(warm_up_simulator())
+        self.assertFalse(warm_up_simulator())
+
+    def test_warm_up_threads_once(self):
+        ''' Test concurrent sessions share one warm up and one pool'''
+
+        close_simulator_pool()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            warm_up_list = list(executor.map(lambda _: warm_up_simulator(),
+                                             range(4)))
+            pool_list = list(executor.map(lambda _: get_simulator_pool(),
+                                          range(4)))
+
+        self.assertEqual(warm_up_list.count(True), 1)
+        self.assertEqual(len({id(pool) for pool in pool_list}), 1)
+
+    def test_import_time_cached(self):
+        ''' Test import time is zero for imported module'''
+
+        self.assertEqual(get_import_time('unittest'), 0.0)
+
+    def test_startup_report(self):
+        ''' Test startup report covers imports and warm up only'''
+
+        close_simulator_pool()
+
+        with self.assertLogs(level='WARNING'):
+            startup_dict = get_startup_report(startup_budget_sec=0.0)
+
+        self.assertFalse(startup_dict['startup_within_budget'])
+        self.assertLess(startup_dict['warm_up_sec'], 60.0)
+        self.assertAlmostEqual(startup_dict['startup_sec'],
+                               startup_dict['import_streamlit_sec'] +
+                               startup_dict['import_simulator_sec'] +
+                               startup_dict['import_numpy_sec'] +
+                               startup_dict['warm_up_sec'] +
+                               startup_dict['warm_up_chart_sec'])
+        self.assertNotIn('first_request_sec', startup_dict)
+        self.assertFalse(warm_up_simulator())
+        self.assertTrue(get_startup_report(
+            startup_budget_sec=60.0)['startup_within_budget'])
+
+    def test_first_request_once(self):
+        ''' Test each first request is only logged once'''
+
+        startup_util.FIRST_REQUEST_SET.clear()
+
+        with self.assertLogs(level='WARNING'):
+            self.assertTrue(log_first_request('first_page_sec', 2.0, 1.0))
+
+        self.assertFalse(log_first_request('first_page_sec', 0.1, 1.0))
+        self.assertTrue(log_first_request('first_simulation_sec', 0.1, 1.0))
+
+    def test_launcher_flags(self):
+        ''' Test launcher pass flags and environment variables to Streamlit'''
+
+        argv = ['run_bdo_simulator_app.py', '--server.headless', 'true']
+
+        with mock.patch.object(sys, 'argv', argv + ['--server.port', '8598']), \
+                mock.patch('run_bdo_simulator_app.initial_log'), \
+                mock.patch('run_bdo_simulator_app.get_startup_report'), \
+                mock.patch('streamlit.web.bootstrap.run') as run_mock, \
+                self.assertRaises(SystemExit):
+            run_bdo_simulator_app.main()
+
+        self.assertEqual(run_mock.call_args[0][0], run_bdo_simulator_app.APP_PATH)
+        self.assertEqual(config.get_option('server.port'), 8598)
+        self.assertTrue(config.get_option('server.headless'))
+
+        with mock.patch.object(sys, 'argv', argv), \
+                mock.patch.dict(os.environ, {'STREAMLIT_SERVER_PORT': '8599'}), \
+                mock.patch('run_bdo_simulator_app.initial_log'), \
+                mock.patch('run_bdo_simulator_app.get_startup_report'), \
+                mock.patch('streamlit.web.bootstrap.run'), \
+                self.assertRaises(SystemExit):
+            run_bdo_simulator_app.main()
+
+        self.assertEqual(config.get_option('server.port'), 8599)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2022 Weikun Han
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+""" Statistics utility library Test
+Author:
+Weikun Han <weikunhan@g.ucla.edu>
+Reference:
+"""
+
+import unittest
+import numpy as np
+from utils.simulator_util import close_simulator_pool
+from utils.simulator_util import collect_bdo_score_statistics
+from utils.simulator_util import simulate_bdo_failed_rate_v1
+from utils.simulator_util import simulate_bdo_succeeded_rate_v1
+from utils.simulator_util import simulate_bdo_succeeded_rate_v2
+from utils.statistics_util import HorizonScoreStatistics
+from utils.statistics_util import ScoreStatistics
+
+class TestStatistics(unittest.TestCase):
+    ''' Statistics utility library Test'''
+
+    def setUp(self):
+        ''' Setup Test'''
+
+        self.score_array = np.random.default_rng(0).uniform(20, 40, size=10000)
+        self.succeeded_rate = 30.0
+        self.time_range = 60
+        self.simiulated_times = 1000
+        self.time_utc_sec = 1660000000
+
+    def tearDown(self):
+        ''' Teardown Test'''
+
+        close_simulator_pool()
+
+    def test_moments_same(self):
+        ''' Test streaming moments match NumPy'''
+
+        statistics = ScoreStatistics()
+
+        for score in self.score_array[:5000]:
+            statistics.update(score)
+
+        statistics.update_array(self.score_array[5000:])
+
+        self.assertEqual(statistics.count, self.score_array.size)
+        self.assertAlmostEqual(statistics.mean, self.score_array.mean())
+        self.assertAlmostEqual(statistics.get_variance(), self.score_array.var())
+        self.assertEqual(statistics.max, self.score_array.max())
+
+    def test_merge_same(self):
+        ''' Test merged shards match one statistics'''
+
+        statistics = ScoreStatistics()
+        statistics.update_array(self.score_array)
+        merged_statistics = ScoreStatistics()
+
+        for shard_array in np.array_split(self.score_array, 7):
+            shard_statistics = ScoreStatistics()
+            shard_statistics.update_array(shard_array)
+            merged_statistics.merge(shard_statistics)
+
+        self.assertAlmostEqual(merged_statistics.mean, statistics.mean)
+        self.assertAlmostEqual(merged_statistics.m2, statistics.m2)
+        self.assertTrue(np.array_equal(merged_statistics.bin_count_array,
+                                       statistics.bin_count_array))
+
+    def test_percentile_close(self):
+        ''' Test percentiles are within the bin resolution'''
+
+        statistics = ScoreStatistics()
+        statistics.update_array(self.score_array)
+
+        for quantile in [0.1, 0.5, 0.99]:
+            self.assertAlmostEqual(statistics.get_quantile(quantile),
+                                   np.quantile(self.score_array, quantile),
+                                   delta=statistics.bin_width)
+
+        self.assertAlmostEqual(statistics.get_percentile(30.0),
+                               (self.score_array <= 30.0).mean() * 100,
+                               delta=0.5)
+
+    def test_horizon_expire(self):
+        ''' Test buckets older than the horizon are dropped'''
+
+        horizon_statistics = HorizonScoreStatistics(horizon_sec=7200,
+                                                    bucket_sec=3600)
+        horizon_statistics.update_array(0, np.full(3 * 3600, 10.0))
+
+        self.assertEqual(len(horizon_statistics.bucket_dict), 2)
+        self.assertEqual(horizon_statistics.get_statistics().count, 7200)
+
+        horizon_statistics.update(0, 10.0)
+
+        self.assertEqual(sorted(horizon_statistics.bucket_dict), [1, 2])
+        self.assertEqual(horizon_statistics.get_statistics().count, 7200)
+
+    def test_horizon_merge_layout(self):
+        ''' Test merging different horizons or bins raise before any change'''
+
+        horizon_statistics = HorizonScoreStatistics(horizon_sec=7200)
+        horizon_statistics.update(0, 10.0)
+
+        for other_statistics in [HorizonScoreStatistics(horizon_sec=3600),
+                                 HorizonScoreStatistics(horizon_sec=7200,
+                                                        bin_count=1000)]:
+            other_statistics.update(3600 * 5, 10.0)
+
+            with self.assertRaises(ValueError):
+                horizon_statistics.merge(other_statistics)
+
+        self.assertEqual(list(horizon_statistics.bucket_dict), [0])
+
+    def test_simulate_feed(self):
+        ''' Test simulate functions feed the same rates'''
+
+        horizon_statistics_v1 = HorizonScoreStatistics()
+        horizon_statistics_v2 = HorizonScoreStatistics()
+        horizon_statistics_stream = HorizonScoreStatistics()
+        _, best_succeeded_rate = simulate_bdo_succeeded_rate_v1(
+            self.succeeded_rate,
+            simiulated_times=self.simiulated_times,
+            time_range=self.time_range,
+            time_utc_sec=self.time_utc_sec,
+            score_statistics=horizon_statistics_v1)
+        simulate_bdo_succeeded_rate_v2(
+            self.succeeded_rate,
+            simiulated_times=self.simiulated_times,
+            time_range=self.time_range,
+            time_utc_sec=self.time_utc_sec,
+            score_statistics=horizon_statistics_v2)
+        collect_bdo_score_statistics(
+            self.succeeded_rate,
+            horizon_statistics_stream,
+            simiulated_times=self.simiulated_times,
+            time_range=self.time_range,
+            time_utc_sec=self.time_utc_sec,
+            chunk_sec=25)
+        statistics_v1 = horizon_statistics_v1.get_statistics()
+
+        self.assertEqual(statistics_v1.count, self.time_range)
+        self.assertEqual(statistics_v1.max, best_succeeded_rate)
+        self.assertAlmostEqual(horizon_statistics_v2.get_statistics().mean,
+                               statistics_v1.mean)
+        self.assertAlmostEqual(horizon_statistics_stream.get_statistics().mean,
+                               statistics_v1.mean)
+        self.assertEqual(horizon_statistics_v1.get_score_report(
+            best_succeeded_rate)['percentile'], 100.0)
+
+    def test_simulate_failed_feed(self):
+        ''' Test failed rates feed the same as the failed simulate function'''
+
+        horizon_statistics = HorizonScoreStatistics()
+        horizon_statistics_stream = HorizonScoreStatistics()
+        _, best_failed_rate = simulate_bdo_failed_rate_v1(
+            self.succeeded_rate,
+            simiulated_times=self.simiulated_times,
+            time_range=self.time_range,
+            time_utc_sec=self.time_utc_sec,
+            score_statistics=horizon_statistics)
+        collect_bdo_score_statistics(
+            self.succeeded_rate,
+            horizon_statistics_stream,
+            simiulated_times=self.simiulated_times,
+            time_range=self.time_range,
+            time_utc_sec=self.time_utc_sec,
+            is_failed=True,
+            chunk_sec=25)
+        statistics = horizon_statistics.get_statistics()
+        statistics_stream = horizon_statistics_stream.get_statistics()
+
+        self.assertEqual(statistics_stream.count, self.time_range)
+        self.assertEqual(statistics_stream.max, best_failed_rate)
+        self.assertAlmostEqual(statistics_stream.mean, statistics.mean)
+        self.assertGreater(statistics_stream.mean, 50.0)
+
+if __name__ == '__main__':
+    unittest.main()
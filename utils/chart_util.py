@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2022 Weikun Han
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+""" Chart utility library
+Author:
+Weikun Han <weikunhan@g.ucla.edu>
+Reference:
+https://vega.github.io/vega-lite/docs/window.html
+"""
+
+TOP_K = 5
+CHART_POINTS_PER_UPDATE_SEC = 3600
+CHART_WARM_UP_DONE = False
+
+# pylint: disable=import-outside-toplevel,global-statement
+
+def warm_up_chart() -> bool:
+    """Import pyarrow and serialize a tiny chart table once
+
+    Streamlit sends the chart table as Arrow IPC bytes, so the first chart
+    draw would otherwise pay for the pyarrow import. Calling it again is a
+    no-op.
+
+    Returns:
+        True if this call did the warm-up, False if it was already done
+    """
+
+    global CHART_WARM_UP_DONE
+
+    if CHART_WARM_UP_DONE:
+        return False
+
+    import pyarrow as pa
+
+    rate_table = get_rate_chart_table(0, get_rate_array(1))
+    sink = pa.BufferOutputStream()
+
+    with pa.ipc.new_stream(sink, rate_table.schema) as writer:
+        writer.write_table(rate_table)
+
+    CHART_WARM_UP_DONE = True
+    return True
+
+def get_rate_array(time_range: int):
+    """Get a zero NumPy float array for the rate of each second"""
+
+    import numpy as np
+
+    return np.zeros(time_range, dtype=np.float64)
+
+def get_chart_update_sec(time_range: int) -> int:
+    """Get seconds between live chart updates, longer for larger windows"""
+
+    return max(time_range // CHART_POINTS_PER_UPDATE_SEC, 1)
+
+def get_rate_chart_table(time_utc_sec: int, rate_array):
+    """Get the Arrow table of the per-second rate chart
+
+    Both columns wrap NumPy buffers without copying, rate_array can be a view
+    such as rate_array[elapsed_sec:].
+
+    Args:
+        time_utc_sec: the UTC time in seconds of the first rate
+        rate_array: the NumPy float array of rates
+
+    Returns:
+        rate_table
+    """
+
+    import numpy as np
+    import pyarrow as pa
+
+    time_array = np.arange(time_utc_sec, time_utc_sec + len(rate_array),
+                           dtype=np.int64).view('datetime64[s]')
+    return pa.table({'time': pa.array(time_array),
+                     'rate': pa.array(np.ascontiguousarray(rate_array))})
+
+def get_rate_chart_spec(rate_name: str, top_k: int = TOP_K) -> dict:
+    """Get the Vega-Lite spec of the per-second rate chart
+
+    The top k seconds are ranked in the browser, so the table only carries
+    the time and rate columns.
+
+    Args:
+        rate_name: the rate title, for example succeeded rate
+        top_k: the number of best seconds to mark
+
+    Returns:
+        rate_chart_spec
+    """
+
+    tooltip_list = [{'field': 'time', 'type': 'temporal',
+                     'timeUnit': 'hoursminutesseconds', 'title': 'time'},
+                    {'field': 'rate', 'type': 'quantitative', 'format': '.2f',
+                     'title': f'{rate_name} (%)'}]
+    return {
+        'width': 'container',
+        'encoding': {
+            'x': {'field': 'time', 'type': 'temporal', 'title': 'time'},
+            'y': {'field': 'rate', 'type': 'quantitative',
+                  'title': f'{rate_name} (%)', 'scale': {'zero': False}}},
+        'layer': [
+            {'mark': {'type': 'line', 'strokeWidth': 1},
+             'encoding': {'tooltip': tooltip_list}},
+            {'transform': [
+                {'window': [{'op': 'row_number', 'as': 'rank'}],
+                 'sort': [{'field': 'rate', 'order': 'descending'}]},
+                {'filter': f'datum.rank <= {top_k}'}],
+             'mark': {'type': 'point', 'filled': True, 'size': 80,
+                      'color': 'red'},
+             'encoding': {'tooltip': [{'field': 'rank', 'type': 'ordinal',
+                                       'title': 'rank'}] + tooltip_list}}]}
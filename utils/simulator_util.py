@@ -29,19 +29,89 @@ Reference:
 """
 
 
+import atexit
 import logging
-import multiprocessing as mp
+import os
+import threading
 from datetime import datetime
-import numpy as np
 
 logger = logging.getLogger()
 
+# NumPy and multiprocessing are imported inside the functions that use them so
+# that importing this module (and the Streamlit app) stays cheap. The pool is
+# spawned once and reused by every simulation, see get_simulator_pool().
+# Each Streamlit session runs in its own thread, so the pool is guarded by a
+# lock.
+SIMULATOR_POOL = None
+SIMULATOR_POOL_LOCK = threading.RLock()
+WARM_UP_DONE = False
+
+# pylint: disable=import-outside-toplevel,global-statement
+
+def get_simulator_pool():
+    """Get the shared simulator process pool, create it on first use
+
+    Returns:
+        pool
+    """
+
+    global SIMULATOR_POOL
+
+    with SIMULATOR_POOL_LOCK:
+        if SIMULATOR_POOL is None:
+            import multiprocessing as mp
+            SIMULATOR_POOL = mp.Pool()
+            logger.debug('Simulator pool created with %s processes. ',
+                         os.cpu_count())
+
+        return SIMULATOR_POOL
+
+def close_simulator_pool() -> None:
+    """Close the shared simulator process pool if it exists"""
+
+    global SIMULATOR_POOL, WARM_UP_DONE
+
+    with SIMULATOR_POOL_LOCK:
+        if SIMULATOR_POOL is not None:
+            SIMULATOR_POOL.close()
+            SIMULATOR_POOL.join()
+            SIMULATOR_POOL = None
+            WARM_UP_DONE = False
+
+atexit.register(close_simulator_pool)
+
+def warm_up_simulator() -> bool:
+    """Run a first tiny simulation and spawn the simulator pool
+
+    The tiny simulation imports NumPy before the pool is forked, so every
+    worker starts with NumPy loaded and the first user request does not pay
+    for it. Calling it again is a no-op.
+
+    Returns:
+        True if this call did the warm-up, False if it was already done
+    """
+
+    global WARM_UP_DONE
+
+    with SIMULATOR_POOL_LOCK:
+        if WARM_UP_DONE:
+            return False
+
+        simulate_bdo_succeeded_rate_v1(0.0, simiulated_times=1, time_range=1)
+        pool = get_simulator_pool()
+        args_list = [(0.0, 1, i) for i in range(os.cpu_count() or 1)]
+        pool.starmap(get_avg_succeeded_count, args_list, chunksize=1)
+        WARM_UP_DONE = True
+        return True
+
 def simulate_bdo_succeeded_rate_v1(
     succeeded_rate: float,
     simiulated_times = 10000,
     time_range: int = 600,
     time_buffer: int = 0,
-    time_utc_sec: int = None
+    time_utc_sec: int = None,
+    score_statistics = None,
+    rate_array = None
 ) -> tuple:
     """Predict game random generator bias for UTC time and succeeded rate
 
@@ -62,12 +132,18 @@ def simulate_bdo_succeeded_rate_v1(
         time_utc_in_sec: the current UTC time in seconds
         time_range: the future time window in seconds
         time_buffer: the possible server latch in seconds
+        score_statistics: the optional HorizonScoreStatistics fed with the
+            rate of each simulated second
+        rate_array: the optional NumPy float array of time_range filled with
+            the rate of each simulated second
 
     Returns:
         best_time_utc_sec
         best_succeeded_rate
     """
 
+    import numpy as np
+
     best_time_utc_sec = 0
     best_succeeded_count = 0
     time_utc_now_sec = int(datetime.utcnow().timestamp())
@@ -82,6 +158,7 @@ def simulate_bdo_succeeded_rate_v1(
                  time_range,
                  time_buffer,
                  simiulated_times)
+    res_list = []
 
     for i in range(time_range):
         positive_case_count = 0
@@ -105,11 +182,14 @@ def simulate_bdo_succeeded_rate_v1(
                      positive_case_count,
                      negative_case_count)
         avg_succeeded_count = (positive_case_count + negative_case_count) / 2.0
+        res_list.append(avg_succeeded_count)
 
         if avg_succeeded_count > best_succeeded_count:
             best_succeeded_count = avg_succeeded_count
             best_time_utc_sec = random_seed_value - time_buffer
 
+    feed_rate_consumers(res_list, simiulated_times, time_utc_now_sec,
+                        score_statistics, rate_array)
     best_succeeded_rate = best_succeeded_count / float(simiulated_times) * 100
     return best_time_utc_sec, best_succeeded_rate
 
@@ -119,7 +199,9 @@ def simulate_bdo_succeeded_rate_v2(
     simiulated_times = 10000,
     time_range: int = 600,
     time_buffer: int = 0,
-    time_utc_sec: int = None
+    time_utc_sec: int = None,
+    score_statistics = None,
+    rate_array = None
 ) -> tuple:
     """Predict game random generator bias for UTC time and succeeded rate
 
@@ -142,6 +224,10 @@ def simulate_bdo_succeeded_rate_v2(
         time_utc_in_sec: the current UTC time in seconds
         time_range: the future time window in seconds
         time_buffer: the possible server latch in seconds
+        score_statistics: the optional HorizonScoreStatistics fed with the
+            rate of each simulated second
+        rate_array: the optional NumPy float array of time_range filled with
+            the rate of each simulated second
 
     Returns:
         best_time_utc_sec
@@ -163,12 +249,12 @@ def simulate_bdo_succeeded_rate_v2(
                  time_range,
                  time_buffer,
                  simiulated_times)
-    pool = mp.Pool()
+    pool = get_simulator_pool()
     args_list = [(succeeded_rate, simiulated_times, time_utc_now_sec + i)
                   for i in range(time_range)]
     res_list = pool.starmap_async(get_avg_succeeded_count, args_list).get()
-    pool.close()
-    pool.join()
+    feed_rate_consumers(res_list, simiulated_times, time_utc_now_sec,
+                        score_statistics, rate_array)
 
     for i, res in enumerate(res_list):
         avg_succeeded_count = res
@@ -180,6 +266,39 @@ def simulate_bdo_succeeded_rate_v2(
     best_succeeded_rate = best_succeeded_count / float(simiulated_times) * 100
     return best_time_utc_sec, best_succeeded_rate
 
+def feed_rate_consumers(
+    res_list: list,
+    simiulated_times: int,
+    time_utc_sec: int,
+    score_statistics = None,
+    rate_array = None
+) -> None:
+    """Feed the rate of each second to the optional consumers
+
+    The rates are computed once with NumPy from the average counts.
+
+    Args:
+        res_list: the average count of each second
+        simiulated_times: the total simulation run each second
+        time_utc_sec: the UTC time in seconds of the first count
+        score_statistics: the optional HorizonScoreStatistics to feed
+        rate_array: the optional NumPy float array to fill
+    """
+
+    if score_statistics is None and rate_array is None:
+        return
+
+    import numpy as np
+
+    res_rate_array = \
+        np.asarray(res_list, dtype=np.float64) / float(simiulated_times) * 100
+
+    if score_statistics is not None:
+        score_statistics.update_array(time_utc_sec, res_rate_array)
+
+    if rate_array is not None:
+        rate_array[:] = res_rate_array
+
 def get_avg_succeeded_count(
     succeeded_rate: float,
     simiulated_times: int,
@@ -195,6 +314,8 @@ def get_avg_succeeded_count(
         avg_succeeded_count
     """
 
+    import numpy as np
+
     positive_case_count = 0
     negative_case_count = 0
     np.random.seed(time_utc_in_sec)
@@ -221,7 +342,9 @@ def simulate_bdo_failed_rate_v1(
     simiulated_times = 10000,
     time_range: int = 600,
     time_buffer: int = 0,
-    time_utc_sec: int = None
+    time_utc_sec: int = None,
+    score_statistics = None,
+    rate_array = None
 ) -> tuple:
     """Predict game random generator bias for UTC time and succeeded rate
 
@@ -244,6 +367,10 @@ def simulate_bdo_failed_rate_v1(
         time_utc_in_sec: the current UTC time in seconds
         time_range: the future time window in seconds
         time_buffer: the possible server latch in seconds
+        score_statistics: the optional HorizonScoreStatistics fed with the
+            rate of each simulated second
+        rate_array: the optional NumPy float array of time_range filled with
+            the rate of each simulated second
 
     Returns:
         best_time_utc_sec
@@ -265,12 +392,12 @@ def simulate_bdo_failed_rate_v1(
                  time_range,
                  time_buffer,
                  simiulated_times)
-    pool = mp.Pool()
+    pool = get_simulator_pool()
     args_list = [(succeeded_rate, simiulated_times, time_utc_now_sec + i)
                   for i in range(time_range)]
     res_list = pool.starmap_async(get_avg_failed_count, args_list).get()
-    pool.close()
-    pool.join()
+    feed_rate_consumers(res_list, simiulated_times, time_utc_now_sec,
+                        score_statistics, rate_array)
 
     for i, res in enumerate(res_list):
         avg_failed_count = res
@@ -297,6 +424,8 @@ def get_avg_failed_count(
         avg_failed_count
     """
 
+    import numpy as np
+
     positive_case_count = 0
     negative_case_count = 0
     np.random.seed(time_utc_in_sec)
@@ -317,3 +446,49 @@ def get_avg_failed_count(
                  positive_case_count,
                  negative_case_count)
     return (positive_case_count + negative_case_count) / 2.0
+
+def collect_bdo_score_statistics(
+    succeeded_rate: float,
+    score_statistics,
+    simiulated_times = 10000,
+    time_range: int = 86400,
+    time_utc_sec: int = None,
+    is_failed: bool = False,
+    chunk_sec: int = 3600
+):
+    """Stream per-second rates of a long seed horizon into the statistics
+
+    The horizon is simulated chunk_sec seconds at a time and each chunk is
+    fed then dropped, so memory does not grow with the time range.
+
+    Args:
+        succeeded_rate: the succeeded rate that user input
+        score_statistics: the HorizonScoreStatistics to feed
+        simiulated_times: the total simulation run each second
+        time_range: the seed horizon in seconds
+        time_utc_sec: the first UTC time in seconds, default is now
+        is_failed: feed failed rates instead of succeeded rates
+        chunk_sec: the seconds simulated per chunk
+
+    Returns:
+        score_statistics
+    """
+
+    time_utc_now_sec = int(datetime.utcnow().timestamp())
+    succeeded_rate *= 100
+    count_func = get_avg_failed_count if is_failed else get_avg_succeeded_count
+
+    if time_utc_sec is not None:
+        time_utc_now_sec = time_utc_sec
+
+    pool = get_simulator_pool()
+
+    for chunk_start in range(0, time_range, chunk_sec):
+        chunk_utc_sec = time_utc_now_sec + chunk_start
+        args_list = [(succeeded_rate, simiulated_times, chunk_utc_sec + i)
+                     for i in range(min(chunk_sec, time_range - chunk_start))]
+        res_list = pool.starmap(count_func, args_list)
+        feed_rate_consumers(res_list, simiulated_times, chunk_utc_sec,
+                            score_statistics)
+
+    return score_statistics
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2022 Weikun Han
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+""" Startup utility library
+Author:
+Weikun Han <weikunhan@g.ucla.edu>
+Reference:
+"""
+
+import importlib
+import logging
+import sys
+import threading
+import time
+
+logger = logging.getLogger()
+
+STARTUP_BUDGET_SEC = 5.0
+FIRST_PAGE_BUDGET_SEC = 1.0
+FIRST_SIMULATION_BUDGET_SEC = 10.0
+FIRST_REQUEST_LOCK = threading.Lock()
+FIRST_REQUEST_SET = set()
+
+def get_import_time(module_name: str) -> float:
+    """Get time in seconds to import the module, 0.0 if already imported"""
+
+    if module_name in sys.modules:
+        return 0.0
+
+    time_start = time.perf_counter()
+    importlib.import_module(module_name)
+    return time.perf_counter() - time_start
+
+def get_startup_report(startup_budget_sec: float = STARTUP_BUDGET_SEC) -> dict:
+    """Warm up the simulator and measure the cold start
+
+    Call it once at server boot, before any user session. It covers the
+    imports, the simulator warm-up (a first tiny simulation and the pool
+    spawn) and the chart warm-up (pyarrow import and a tiny Arrow table), the
+    first requests are measured by log_first_request() once the server is up.
+
+    Args:
+        startup_budget_sec: the budget for imports and warm-up in seconds
+
+    Returns:
+        startup_dict
+    """
+
+    startup_dict = {}
+    startup_dict['import_streamlit_sec'] = get_import_time('streamlit')
+    startup_dict['import_simulator_sec'] = get_import_time('utils.simulator_util')
+    startup_dict['import_numpy_sec'] = get_import_time('numpy')
+    simulator_util = importlib.import_module('utils.simulator_util')
+    time_start = time.perf_counter()
+    simulator_util.warm_up_simulator()
+    startup_dict['warm_up_sec'] = time.perf_counter() - time_start
+    chart_util = importlib.import_module('utils.chart_util')
+    time_start = time.perf_counter()
+    chart_util.warm_up_chart()
+    startup_dict['warm_up_chart_sec'] = time.perf_counter() - time_start
+    startup_dict['startup_sec'] = (startup_dict['import_streamlit_sec'] +
+                                   startup_dict['import_simulator_sec'] +
+                                   startup_dict['import_numpy_sec'] +
+                                   startup_dict['warm_up_sec'] +
+                                   startup_dict['warm_up_chart_sec'])
+    startup_dict['startup_within_budget'] = \
+        startup_dict['startup_sec'] <= startup_budget_sec
+
+    for key, value in startup_dict.items():
+        logger.info('Startup report %s=%s. ', key, value)
+
+    if not startup_dict['startup_within_budget']:
+        logger.warning('Startup took %.2fs, over the %.2fs budget. ',
+                       startup_dict['startup_sec'], startup_budget_sec)
+
+    return startup_dict
+
+def log_first_request(
+    request_name: str,
+    request_sec: float,
+    request_budget_sec: float
+) -> bool:
+    """Log the latency of the first request of this name in this process
+
+    The app logs first_page_sec, from the first line of its first script run
+    to the menu drawn (Streamlit reading and compiling the script comes before
+    and is not included), and first_simulation_sec, from the first simulation
+    start to its result drawn.
+
+    Args:
+        request_name: the report entry, for example first_page_sec
+        request_sec: the time in seconds the request took
+        request_budget_sec: the budget for the request in seconds
+
+    Returns:
+        True if this call logged the request, False if already logged
+    """
+
+    with FIRST_REQUEST_LOCK:
+        if request_name in FIRST_REQUEST_SET:
+            return False
+
+        FIRST_REQUEST_SET.add(request_name)
+
+    logger.info('Startup report %s=%s. ', request_name, request_sec)
+
+    if request_sec > request_budget_sec:
+        logger.warning('Startup report %s took %.2fs, over the %.2fs budget. ',
+                       request_name, request_sec, request_budget_sec)
+
+    return True
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2022 Weikun Han
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+""" Statistics utility library
+Author:
+Weikun Han <weikunhan@g.ucla.edu>
+Reference:
+https://en.wikipedia.org/wiki/Algorithms_for_calculating_variance
+"""
+
+import math
+
+# pylint: disable=import-outside-toplevel
+
+class ScoreStatistics:
+    """Constant memory statistics of per-second scores
+
+    Mean and variance use Welford moments, percentiles use a fixed bin
+    histogram over [min_score, max_score]. Both merge exactly, so workers or
+    shards can collect separately and merge the results.
+
+    Args:
+        min_score: the lowest possible score
+        max_score: the highest possible score
+        bin_count: the histogram bins, (max_score - min_score) / bin_count is
+            the percentile resolution
+    """
+
+    def __init__(
+        self,
+        min_score: float = 0.0,
+        max_score: float = 100.0,
+        bin_count: int = 2000
+    ):
+        import numpy as np
+
+        self.min_score = min_score
+        self.max_score = max_score
+        self.bin_count = bin_count
+        self.bin_width = (max_score - min_score) / bin_count
+        self.bin_count_array = np.zeros(bin_count, dtype=np.int64)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, score: float) -> None:
+        """Add one score"""
+
+        self.count += 1
+        delta = score - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (score - self.mean)
+        self.min = min(self.min, score)
+        self.max = max(self.max, score)
+        self.bin_count_array[self.get_bin_index(score)] += 1
+
+    def update_array(self, score_array) -> None:
+        """Add an array of scores"""
+
+        import numpy as np
+
+        score_array = np.asarray(score_array, dtype=np.float64)
+
+        if score_array.size == 0:
+            return
+
+        bin_index_array = np.clip(
+            ((score_array - self.min_score) / self.bin_width).astype(np.int64),
+            0, self.bin_count - 1)
+        self.bin_count_array += np.bincount(
+            bin_index_array, minlength=self.bin_count)
+        self.merge_moments(int(score_array.size),
+                           float(score_array.mean()),
+                           float(((score_array - score_array.mean()) ** 2).sum()),
+                           float(score_array.min()),
+                           float(score_array.max()))
+
+    def merge(self, other: 'ScoreStatistics') -> None:
+        """Merge another statistics with the same bins into this one"""
+
+        if (other.min_score, other.max_score, other.bin_count) != \
+                (self.min_score, self.max_score, self.bin_count):
+            raise ValueError('Cannot merge statistics with different bins')
+
+        self.bin_count_array += other.bin_count_array
+        self.merge_moments(other.count, other.mean, other.m2,
+                           other.min, other.max)
+
+    def merge_moments(
+        self,
+        count: int,
+        mean: float,
+        m2: float,
+        min_score: float,
+        max_score: float
+    ) -> None:
+        """Merge moments with Chan et al. parallel algorithm"""
+
+        if count == 0:
+            return
+
+        total_count = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total_count
+        self.m2 += m2 + delta ** 2 * self.count * count / total_count
+        self.count = total_count
+        self.min = min(self.min, min_score)
+        self.max = max(self.max, max_score)
+
+    def get_bin_index(self, score: float) -> int:
+        """Get histogram bin index of the score"""
+
+        bin_index = int((score - self.min_score) / self.bin_width)
+        return min(max(bin_index, 0), self.bin_count - 1)
+
+    def get_variance(self) -> float:
+        """Get population variance"""
+
+        return self.m2 / self.count if self.count else 0.0
+
+    def get_std(self) -> float:
+        """Get population standard deviation"""
+
+        return math.sqrt(self.get_variance())
+
+    def get_z_score(self, score: float) -> float:
+        """Get z-score of the score, 0.0 if the scores have no spread"""
+
+        std = self.get_std()
+        return (score - self.mean) / std if std > 0 else 0.0
+
+    def get_percentile(self, score: float) -> float:
+        """Get percent of scores less or equal to the score
+
+        Scores inside the same bin are treated as uniform.
+        """
+
+        if self.count == 0 or score < self.min:
+            return 0.0
+
+        if score >= self.max:
+            return 100.0
+
+        bin_index = self.get_bin_index(score)
+        bin_start = self.min_score + bin_index * self.bin_width
+        bin_fraction = min(max((score - bin_start) / self.bin_width, 0.0), 1.0)
+        below_count = float(self.bin_count_array[:bin_index].sum())
+        below_count += bin_fraction * float(self.bin_count_array[bin_index])
+        return below_count / self.count * 100
+
+    def get_quantile(self, quantile: float) -> float:
+        """Get score at the quantile in [0, 1]"""
+
+        import numpy as np
+
+        if self.count == 0:
+            return math.nan
+
+        cumsum_array = np.cumsum(self.bin_count_array)
+        target_count = quantile * self.count
+        bin_index = min(int(np.searchsorted(cumsum_array, target_count)),
+                        self.bin_count - 1)
+        below_count = float(cumsum_array[bin_index - 1]) if bin_index else 0.0
+        bin_fraction = (target_count - below_count) / \
+            max(float(self.bin_count_array[bin_index]), 1.0)
+        score = self.min_score + (bin_index + bin_fraction) * self.bin_width
+        return min(max(score, self.min), self.max)
+
+    def get_summary(self) -> dict:
+        """Get count, mean, variance, std, min, max and main percentiles"""
+
+        return {'count': self.count,
+                'mean': self.mean,
+                'variance': self.get_variance(),
+                'std': self.get_std(),
+                'min': self.min,
+                'max': self.max,
+                'p50': self.get_quantile(0.50),
+                'p90': self.get_quantile(0.90),
+                'p99': self.get_quantile(0.99)}
+
+class HorizonScoreStatistics:
+    """Per-second score statistics over the last horizon_sec seconds
+
+    Scores are kept in one ScoreStatistics per bucket_sec seconds, the oldest
+    bucket is dropped when a new one starts past the horizon, so memory only
+    depends on horizon_sec / bucket_sec.
+
+    Args:
+        horizon_sec: the horizon in seconds, for example 86400 for one day
+        bucket_sec: the bucket size in seconds
+        min_score: the lowest possible score
+        max_score: the highest possible score
+        bin_count: the histogram bins of each bucket
+    """
+
+    def __init__(
+        self,
+        horizon_sec: int = 86400,
+        bucket_sec: int = 3600,
+        min_score: float = 0.0,
+        max_score: float = 100.0,
+        bin_count: int = 2000
+    ):
+        self.bucket_count = max(horizon_sec // bucket_sec, 1)
+        self.bucket_sec = bucket_sec
+        self.min_score = min_score
+        self.max_score = max_score
+        self.bin_count = bin_count
+        self.bucket_dict = {}
+
+    def get_bucket(self, time_utc_sec: int):
+        """Get the bucket of the UTC time, create it and drop expired buckets
+
+        Returns:
+            bucket, None if the UTC time is older than the horizon
+        """
+
+        bucket_index = time_utc_sec // self.bucket_sec
+
+        if bucket_index not in self.bucket_dict:
+            last_bucket_index = max(self.bucket_dict, default=bucket_index)
+
+            # scores older than the horizon are skipped
+            if bucket_index <= last_bucket_index - self.bucket_count:
+                return None
+
+            self.bucket_dict[bucket_index] = ScoreStatistics(
+                self.min_score, self.max_score, self.bin_count)
+
+            for expired_index in [i for i in self.bucket_dict
+                                  if i <= bucket_index - self.bucket_count]:
+                del self.bucket_dict[expired_index]
+
+        return self.bucket_dict[bucket_index]
+
+    def update(self, time_utc_sec: int, score: float) -> None:
+        """Add the score of the UTC time"""
+
+        bucket = self.get_bucket(time_utc_sec)
+
+        if bucket is not None:
+            bucket.update(score)
+
+    def update_array(self, time_utc_sec: int, score_array) -> None:
+        """Add scores of consecutive seconds starting at the UTC time"""
+
+        index = 0
+
+        while index < len(score_array):
+            bucket_end_sec = \
+                ((time_utc_sec + index) // self.bucket_sec + 1) * self.bucket_sec
+            next_index = min(bucket_end_sec - time_utc_sec, len(score_array))
+            bucket = self.get_bucket(time_utc_sec + index)
+
+            if bucket is not None:
+                bucket.update_array(score_array[index:next_index])
+
+            index = next_index
+
+    def merge(self, other: 'HorizonScoreStatistics') -> None:
+        """Merge another horizon statistics with the same buckets and bins"""
+
+        if (other.bucket_sec, other.bucket_count, other.min_score,
+                other.max_score, other.bin_count) != \
+                (self.bucket_sec, self.bucket_count, self.min_score,
+                 self.max_score, self.bin_count):
+            raise ValueError('Cannot merge statistics with different buckets')
+
+        for bucket_index, bucket in sorted(other.bucket_dict.items()):
+            self_bucket = self.get_bucket(bucket_index * self.bucket_sec)
+
+            if self_bucket is not None:
+                self_bucket.merge(bucket)
+
+    def get_statistics(self) -> ScoreStatistics:
+        """Get statistics merged over the horizon"""
+
+        statistics = ScoreStatistics(
+            self.min_score, self.max_score, self.bin_count)
+
+        for bucket in self.bucket_dict.values():
+            statistics.merge(bucket)
+
+        return statistics
+
+    def get_score_report(self, score: float) -> dict:
+        """Get percentile and z-score of the score over the horizon"""
+
+        statistics = self.get_statistics()
+        return {'score': score,
+                'percentile': statistics.get_percentile(score),
+                'z_score': statistics.get_z_score(score),
+                'horizon_sec': self.bucket_count * self.bucket_sec,
+                **statistics.get_summary()}